@@ -1,6 +1,6 @@
-import struct
+import hashlib
 import itertools
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
 from plyfile import PlyData, PlyElement
 import numpy as np
@@ -38,8 +38,10 @@ basetype_struct_codes = { k: v[1] for k,v in basetype_data.items()}
 # Map of Qt3D base types to numpy types
 basetype_numpy_codes = { k: np.sctypeDict[v] for k,v in basetype_struct_codes.items()}
 
-# And the reverse
-basetype_numpy_codes_reverse = { np.sctypeDict[v] : k for k, v in basetype_struct_codes.items() }
+# And the reverse, keyed by numpy's single-character dtype codes (which
+# coincide with the struct codes) so lookups are a plain string hash on
+# array.dtype.char rather than a scalar-type object
+basetype_numpy_codes_reverse = { np.dtype(v).char : k for k, v in basetype_struct_codes.items() }
 
 def rotateAround( v1, v2, angle ):
     q = QQuaternion.fromAxisAndAngle( v2, angle )
@@ -47,21 +49,59 @@ def rotateAround( v1, v2, angle ):
 
 AttrSpec = namedtuple('AttrSpec', 'name, column, numcols')
 
+# Cache of geometry byte arrays keyed by content digest, so re-selecting a
+# recently viewed mesh reuses the existing payload instead of copying it
+# again.  QByteArray is implicitly shared, so handing the same instance to
+# several QBuffers costs only a reference.  The cache is a small LRU (like
+# AthenaViewer's mesh-buffer cache): decoration payloads from tool runs
+# essentially never repeat, so an unbounded cache would grow monotonically
+# for the life of the session.  Eviction only drops the cache's reference;
+# live QBuffers pin their own payload via _keepalive.
+_byte_array_cache = OrderedDict()
+_byte_array_cache_size = 16
+
+def invalidateBufferCache():
+    '''Drop all cached geometry byte arrays'''
+    _byte_array_cache.clear()
+
+def bufferFromArray( parent, array ):
+    '''
+    Build a Qt3DRender.QBuffer over the given ndarray's contents
+
+    QByteArray.fromRawData aliases the Python bytes object rather than
+    copying it into Qt's heap, so this costs one copy of the array data
+    rather than two (and none at all when the same contents are still
+    among the recently used cache entries).  A reference to the raw
+    bytes is kept on the QBuffer to keep that storage alive for the
+    buffer's lifetime.
+    '''
+    rawstring = np.ascontiguousarray( array ).tobytes()
+    key = hashlib.blake2b( rawstring, digest_size=16 ).digest()
+    cached = _byte_array_cache.get( key )
+    if cached is None:
+        # The PySide2 5.12 binding of fromRawData requires an explicit size
+        cached = ( rawstring, QByteArray.fromRawData( rawstring, len(rawstring) ) )
+        _byte_array_cache[ key ] = cached
+        if len(_byte_array_cache) > _byte_array_cache_size:
+            _byte_array_cache.popitem( last=False )
+    else:
+        _byte_array_cache.move_to_end( key )
+    qbuffer = Qt3DRender.QBuffer(parent)
+    qbuffer.setData( cached[1] )
+    qbuffer._keepalive = cached
+    return qbuffer
+
 def buildVertexAttrs(parent, array, attrspecs ):
 
     # Measure the input array
     rows = len(array)
     columns = len(array[0])
-    basetype = basetype_numpy_codes_reverse[array.dtype.type]
+    basetype = basetype_numpy_codes_reverse[array.dtype.char]
     basetype_width = basetype_widths[ basetype ]
     row_width = columns * basetype_width
     #print(columns, rows, basetype, basetype_width, row_width)
 
-    # Convert input to a qt buffer
-    rawstring = array.tobytes()
-    byte_array = QByteArray(rawstring)
-    qbuffer = Qt3DRender.QBuffer(parent)
-    qbuffer.setData(byte_array)
+    qbuffer = bufferFromArray( parent, array )
 
     attrs = list()
     for asp in attrspecs:
@@ -80,14 +120,8 @@ def buildVertexAttrs(parent, array, attrspecs ):
 
 def buildIndexAttr(parent, array):
 
-    basetype = basetype_numpy_codes_reverse[array.dtype.type]
-    basetype_width = basetype_widths[ basetype ]
-
-    basetype_width = array.itemsize
-    rawstring = array.tobytes()
-    byte_array = QByteArray(rawstring)
-    qbuffer = Qt3DRender.QBuffer(parent)
-    qbuffer.setData(byte_array)
+    basetype = basetype_numpy_codes_reverse[array.dtype.char]
+    qbuffer = bufferFromArray( parent, array )
 
     attr = Qt3DRender.QAttribute(parent)
     attr.setVertexBaseType(basetype)
@@ -98,25 +132,38 @@ def buildIndexAttr(parent, array):
     return attr
 
 
-def iterAttr( att ):
-    '''Iterator over a Qt3DRender.QAttribute'''
-    basetype = att.vertexBaseType()
-    width = basetype_widths[ basetype ]
-    struct_code = basetype_struct_codes[ basetype ]
-    att_data = att.buffer().data().data()
-    byteOffset = att.byteOffset()
+def attrToArray( att ):
+    '''
+    Return the contents of a Qt3DRender.QAttribute as a numpy
+    array of shape (count, vertex_size)
+
+    This decodes the attribute's entire backing buffer in a single
+    C-level operation, rather than unpacking each vertex in Python.
+    The returned array is a read-only view over the Qt buffer data.
+    '''
+    dt = np.dtype( basetype_numpy_codes[ att.vertexBaseType() ] )
     byteStride = att.byteStride()
-    count = att.count()
     vertex_size = att.vertexSize()
-    #print( width, struct_code, byteOffset, byteStride, vertex_size, count )
+    count = att.count()
     # Support index attributes, which report zero stride and size
     if byteStride == 0:
-        byteStride = width
+        byteStride = dt.itemsize
     if vertex_size == 0:
         vertex_size = 1
-    for i in range (byteOffset, byteOffset + byteStride * count, byteStride ):
-        datum = struct.unpack( struct_code*vertex_size, bytes(att_data[i:i+(width*vertex_size)]) )
-        yield datum
+    # QByteArray supports the buffer protocol, so view it through a
+    # memoryview rather than calling .data(), which copies the whole
+    # buffer into a Python bytes object
+    raw = np.frombuffer( memoryview( att.buffer().data() ), dtype=np.uint8 )
+    begin = att.byteOffset()
+    end = begin + (count-1) * byteStride + vertex_size * dt.itemsize
+    base = raw[begin:end].view( dt )
+    return np.lib.stride_tricks.as_strided( base, shape=(count, vertex_size),
+                                            strides=(byteStride, dt.itemsize) )
+
+def iterAttr( att ):
+    '''Iterator over a Qt3DRender.QAttribute, yielding one tuple per vertex'''
+    for row in attrToArray( att ).tolist():
+        yield tuple(row)
 
 def grouper(i, n):
     '''from the itertools recipe list: yield n-sized lists of items from iterator i'''
@@ -150,8 +197,10 @@ def dumpGeometry( geom, dumpf=print ):
             count = att.count()
             num_tris = int(count / 3)
             dumpf( num_tris, "triangles" )
-            for tri in grouper(iterAttr(att), 3):
-                dumpf(tri)
+            # The index attribute is a flat integer array, so triangles can
+            # be had with a reshape rather than a pair of nested generators
+            for tri in attrToArray(att).reshape(-1,3).tolist():
+                dumpf(tuple(tri))
 class AABB:
     '''
     An axis-aligned bounding box around the given geometry
@@ -159,21 +208,15 @@ class AABB:
     def __init__(self, geom):
         if hasattr(geom, 'allVertices'):
             # Something lke bildparser.OutputDecorations
-            it = geom.allVertices()
+            arr = np.array( list( geom.allVertices() ) )
         else:
             # assume it's a qt3d geometry
             vertices = getQAttribute( geom, att_name = Qt3DRender.QAttribute.defaultPositionAttributeName() )
-            it = iterAttr(vertices)
-        v0 = next(it)
-        self.min = vec3d( v0[0], v0[1], v0[2])
-        self.max = vec3d( self.min  )
-        for v in it:
-            self.min.setX( min( self.min.x(), v[0] ) )
-            self.min.setY( min( self.min.y(), v[1] ) )
-            self.min.setZ( min( self.min.z(), v[2] ) )
-            self.max.setX( max( self.max.x(), v[0] ) )
-            self.max.setY( max( self.max.y(), v[1] ) )
-            self.max.setZ( max( self.max.z(), v[2] ) )
+            arr = attrToArray(vertices)
+        mn = arr[:,:3].min(axis=0)
+        mx = arr[:,:3].max(axis=0)
+        self.min = vec3d( *mn.tolist() )
+        self.max = vec3d( *mx.tolist() )
         self.center = (self.min+self.max) / 2.0
 
     def iterCorners(self, cons = vec3d):
@@ -198,41 +241,24 @@ def transformBetween( aabb1, aabb2 ):
     the returned transformation doesn't pancake all 3D inputs.
     '''
 
-    def np_coords_from_aabb(aabb):
-        return np.array( list ( aabb.iterCorners(cons=lambda *x:np.array([*x]) ) ) )
+    # A mapping between axis-aligned boxes is fully determined by a per-axis
+    # scale and translation, so compute those in closed form rather than
+    # least-squares fitting an affine matrix over the eight box corners.
+    dims_from = np.array( aabb1.dimensions() )
+    dims_to = np.array( aabb2.dimensions() )
 
-    coord_from = np_coords_from_aabb( aabb1 )
-    coord_to = np_coords_from_aabb( aabb2 )
+    # A degenerate (flat) axis maps with unit scale
+    scale = np.divide( dims_to, dims_from, out=np.ones(3), where=(dims_from != 0) )
 
-    def all_zero(x): return all([x==0 for x in x])
-    if all_zero(coord_to[:,2]) and all_zero(coord_from[:,2]):
+    if dims_from[2] == 0 and dims_to[2] == 0:
         # Both boxes are flat in Z, so ensure Z direction scales uniformly with x and y in the returned transformation
-        span_from = aabb1.dimensions()[0:2]
-        span_to = aabb2.dimensions()[0:2]
-        ratio_x = span_to[0] / span_from[0]
-        ratio_y = span_to[1] / span_from[1]
-        ratio = (ratio_x + ratio_y) / 2
-        min_rows = (0,2,4,6)
-        max_rows = (1,3,5,7)
-        coord_from[min_rows,2] = -1
-        coord_from[max_rows,2] = 1
-        coord_to[min_rows,2] = -ratio
-        coord_to[max_rows,2] = ratio
-
-    # https://stackoverflow.com/questions/20546182/how-to-perform-coordinates-affine-transformation-using-python-part-2
-
-    n = coord_from.shape[0]
-    pad = lambda x: np.hstack([x, np.ones((x.shape[0],1))])
-    unpad = lambda x: x[:,:-1]
-
-    X = pad(coord_from)
-    Y = pad(coord_to)
-
-    A, res, rank, s = np.linalg.lstsq(X, Y, rcond=None)
+        scale[2] = ( scale[0] + scale[1] ) / 2
 
-    transform = lambda x: unpad(np.dot(pad(x), A))
+    min_from = np.array( [aabb1.min.x(), aabb1.min.y(), aabb1.min.z()] )
+    min_to = np.array( [aabb2.min.x(), aabb2.min.y(), aabb2.min.z()] )
+    translate = min_to - scale * min_from
 
-    return transform
+    return lambda x: x * scale + translate
 
 
 
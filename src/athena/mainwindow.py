@@ -1,6 +1,7 @@
 import sys
 from string import capwords
-import subprocess
+import functools
+import json
 import os
 import os.path
 import platform
@@ -10,9 +11,9 @@ from datetime import datetime
 from pathlib import Path
 
 from PySide2.QtUiTools import QUiLoader
-from PySide2.QtWidgets import QMainWindow, QApplication, QLabel, QPushButton, QStatusBar, QFileDialog, QWidget, QSizePolicy, QColorDialog, QStackedWidget, QTreeWidget, QTreeWidgetItem, QHeaderView, QActionGroup, QButtonGroup, QMessageBox, QToolBox
+from PySide2.QtWidgets import QMainWindow, QApplication, QLabel, QPushButton, QStatusBar, QFileDialog, QWidget, QSizePolicy, QColorDialog, QStackedWidget, QTreeView, QHeaderView, QActionGroup, QButtonGroup, QMessageBox, QToolBox
 from PySide2.QtGui import QKeySequence, QPixmap, QIcon, QColor
-from PySide2.QtCore import QFile, Qt, Signal
+from PySide2.QtCore import QFile, QBuffer, Qt, Signal, QProcess, QAbstractItemModel, QModelIndex, QTimer, QObject, QRunnable, QThreadPool, QEvent
 import PySide2.QtXml #Temporary pyinstaller workaround
 
 from athena import bildparser, viewer, screenshot, geom, ATHENA_DIR, ATHENA_OUTPUT_DIR, ATHENA_SRC_DIR, logwindow, __version__
@@ -36,15 +37,38 @@ class AutoResizingStackedWidget( QStackedWidget ):
     def __init__(self, *args, **kw):
         super().__init__(*args, **kw)
         self.k_max_width = -1
+        # Last-known sizeHint width per page.  sizeHint() is a recursive
+        # layout walk, so pages are only re-measured after they post a
+        # LayoutRequest, not on every tab change.
+        self._hint_widths = {}
+
+    def eventFilter( self, obj, event ):
+        if event.type() == QEvent.LayoutRequest and obj in self._hint_widths:
+            self._hint_widths[obj] = -1
+        return super().eventFilter( obj, event )
+
+    def _pageHintWidth( self, page ):
+        width = self._hint_widths.get( page, -1 )
+        if width < 0:
+            if page not in self._hint_widths:
+                page.installEventFilter( self )
+            width = page.sizeHint().width()
+            self._hint_widths[ page ] = width
+        return width
 
     def _updateSizePolicy(self, current_idx):
         # self.k_max_width is the largest child widget width seen so far.
         # Child widgets may shrink in width (e.g. when QToolBoxes change
         # tabs), but this container will never shrink in width: this avoids
         # screen rendering artifacts on OSX.
-        max_width = max( self.widget(x).sizeHint().width() for x in range(self.count()))
+        max_width = max( self._pageHintWidth( self.widget(x) ) for x in range(self.count()))
+        grown = max_width > self.k_max_width
         self.k_max_width = max( self.k_max_width, max_width )
         for page_idx in range(self.count()):
+            # When the maximum width hasn't changed, only the outgoing and
+            # incoming pages need their policies touched
+            if not grown and page_idx not in ( current_idx, self.currentIndex() ):
+                continue
             h_policy = QSizePolicy.Minimum # self.widget(page_idx).sizePolicy().horizontalPolicy()
             v_policy = QSizePolicy.Maximum if page_idx == current_idx else QSizePolicy.Ignored
             self.widget(page_idx).setMinimumSize( self.k_max_width,0 )
@@ -57,52 +81,194 @@ class AutoResizingStackedWidget( QStackedWidget ):
             self.adjustSize()
         super().setCurrentIndex( idx )
 
-class FileSelectionTreeWidget( QTreeWidget ):
+class GeometryListModel( QAbstractItemModel ):
+    '''
+    Two-level model behind FileSelectionTreeWidget
+
+    Three fixed section headings each hold a list of (name, path) pairs.
+    Rows are plain list entries rather than per-row item objects, so
+    memory scales with the bare file list and the view only ever queries
+    the rows it is actually painting.
+    '''
+
+    headings = ( '2D Examples', '3D Examples', 'Loaded Files' )
+
+    def __init__( self, parent=None ):
+        super().__init__( parent )
+        self.sections = [ list() for _ in self.headings ]
+
+    # File indexes carry their section number plus one as the internal
+    # id; section indexes carry zero.
+    def index( self, row, column, parent=QModelIndex() ):
+        if not parent.isValid():
+            return self.createIndex( row, column, 0 )
+        return self.createIndex( row, column, parent.row() + 1 )
+
+    def parent( self, index ):
+        section = index.internalId()
+        if section == 0:
+            return QModelIndex()
+        return self.createIndex( section - 1, 0, 0 )
+
+    def rowCount( self, parent=QModelIndex() ):
+        if not parent.isValid():
+            return len( self.headings )
+        if parent.internalId() == 0:
+            return len( self.sections[ parent.row() ] )
+        return 0
+
+    def columnCount( self, parent=QModelIndex() ):
+        return 1
+
+    def flags( self, index ):
+        if index.internalId() == 0:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def data( self, index, role=Qt.DisplayRole ):
+        section = index.internalId()
+        if section == 0:
+            if role == Qt.DisplayRole:
+                return self.headings[ index.row() ]
+            return None
+        name, filepath = self.sections[ section - 1 ][ index.row() ]
+        if role == Qt.DisplayRole:
+            return name
+        if role == Qt.UserRole:
+            return filepath
+        return None
+
+    def headerData( self, section, orientation, role=Qt.DisplayRole ):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return 'Geometry'
+        return None
+
+    def addFiles( self, section, entries ):
+        '''
+        Append (name, path) pairs under a section in one insertion; returns
+        the index of the first added row
+        '''
+        entries = list( entries )
+        if not entries:
+            return QModelIndex()
+        files = self.sections[ section ]
+        parent = self.index( section, 0 )
+        first = len( files )
+        self.beginInsertRows( parent, first, first + len( entries ) - 1 )
+        files.extend( entries )
+        self.endInsertRows()
+        return self.index( first, 0, parent )
+
+    def clearSection( self, section ):
+        files = self.sections[ section ]
+        if not files:
+            return
+        self.beginRemoveRows( self.index( section, 0 ), 0, len( files ) - 1 )
+        files.clear()
+        self.endRemoveRows()
+
+
+class FileSelectionTreeWidget( QTreeView ):
 
     def __init__(self, *args, **kw):
         super().__init__(*args, **kw)
+        self.setModel( GeometryListModel( self ) )
+        # Every row is a single line of text, so spare the view its
+        # per-row height queries
+        self.setUniformRowHeights( True )
         self.header().setSectionResizeMode( 0, QHeaderView.ResizeToContents )
         #self.setStretchLastSection(False)
-        self.currentItemChanged.connect( self.handleSelect )
+        self._suppress_emit = False
+        self.selectionModel().currentChanged.connect( self.handleSelect )
 
     @staticmethod
-    def prettyNameFromPath( input_path ):
+    @functools.lru_cache(maxsize=512)
+    def _prettyNameFromStem( stem ):
         # make words from the file stem, capitalize them, omit a leading number if possible
-        # e.g. path/to/06_rhombic_tiling -> 'Rhombic Tiling'
+        # e.g. 06_rhombic_tiling -> 'Rhombic Tiling'
         # Hyphens are treated like underscores but not replaced with a space
-        words = input_path.stem.split('_')
+        words = stem.split('_')
         if len(words) > 1 and words[0].isdigit(): words = words[1:]
         return ' '.join( capwords(word,'-') for word in words )
 
-    def _addFile( self, heading, name, filepath ):
-        item = QTreeWidgetItem( heading )
-        item.setText( 0, name )
-        item.setData( 0, Qt.UserRole, filepath.resolve() )
-        item.setFlags( Qt.ItemIsSelectable | Qt.ItemIsEnabled )
-        return item
+    @staticmethod
+    def prettyNameFromPath( input_path ):
+        # The string work is memoized on the stem, which keeps the cache
+        # keys hashable and lets identically-named files share an entry
+        return FileSelectionTreeWidget._prettyNameFromStem( input_path.stem )
 
-    def add2DExampleFile( self, filepath ):
-        self._addFile( self.topLevelItem(0), self.prettyNameFromPath(filepath), filepath )
+    def addExampleFiles( self, section, entries ):
+        '''
+        Bulk-add (name, filepath) pairs under the given top-level section
 
-    def add3DExampleFile( self, filepath ):
-        self._addFile( self.topLevelItem(1), self.prettyNameFromPath(filepath), filepath )
+        The whole batch is announced to the view with a single
+        beginInsertRows/endInsertRows pair, so it costs one layout pass
+        instead of one per item.
+        '''
+        self.model().addFiles( section, entries )
 
     def addUserFile( self, filepath, force_select = False ):
-        item = self._addFile( self.topLevelItem(2), filepath.name, filepath )
+        index = self.model().addFiles( 2, [ (filepath.name, filepath) ] )
         if( force_select ):
-            self.setCurrentItem( item )
+            # Select without the currentChanged side effects, then emit
+            # newFileSelected once the insert is committed; a future
+            # batch import can thus select as it goes and trigger only
+            # one mesh load at the end.
+            self._suppress_emit = True
+            try:
+                self.setCurrentIndex( index )
+            finally:
+                self._suppress_emit = False
+            self.newFileSelected.emit( filepath.resolve() )
+
+    def clearUserFiles( self ):
+        self.model().clearSection( 2 )
 
     newFileSelected = Signal( Path )
 
-    def handleSelect( self, current_item, previous_item ):
-        data = current_item.data( 0, Qt.UserRole )
+    def handleSelect( self, current, previous ):
+        if self._suppress_emit:
+            return
+        data = current.data( Qt.UserRole )
         if data is not None:
-            self.newFileSelected.emit( data )
+            # Stored paths are not necessarily canonical: symlink
+            # resolution is deferred to selection time so that populating
+            # the tree costs no stat calls at all
+            self.newFileSelected.emit( data.resolve() )
 
     def mousePressEvent( self, event ):
         super().mousePressEvent(event)
         self.repaint()
 
+# The color dialog shared by every ColorButton.  The static
+# QColorDialog.getColor helper builds the entire picker widget tree on
+# each click; one lazily-created shared instance avoids that and also
+# preserves the user's custom-color swatches between invocations.
+_color_dialog = None
+
+def sharedColorDialog():
+    global _color_dialog
+    if _color_dialog is None:
+        _color_dialog = QColorDialog()
+    return _color_dialog
+
+
+@functools.lru_cache(maxsize=64)
+def _swatchIcon( rgba ):
+    '''
+    Shared flat-color swatch icon for the given QRgb value
+
+    All ColorButtons draw from this cache, so re-picking a color (for
+    instance, resetting to a default) reuses the existing pixels instead
+    of filling a new pixmap; the lazy construction also guarantees no
+    QPixmap exists before the QApplication does.  At 64 entries of
+    35x12 pixels the ceiling is around 100 KB.
+    '''
+    swatch = QPixmap( 35, 12 )
+    swatch.fill( QColor.fromRgba( rgba ) )
+    return QIcon( swatch )
+
+
 class ColorButton(QPushButton):
     def __init__( self, *args, **kw ):
         super().__init__(*args, **kw)
@@ -113,17 +279,16 @@ class ColorButton(QPushButton):
     colorChosen = Signal(QColor)
 
     def chooseColor( self ):
-        color = QColorDialog.getColor(self.color)
-        if( color.isValid() ):
-            self.colorChosen.emit(color)
+        dialog = sharedColorDialog()
+        dialog.setCurrentColor( self.color )
+        if( dialog.exec_() == QColorDialog.Accepted ):
+            self.colorChosen.emit( dialog.currentColor() )
 
     def setColor( self, color ):
         self.color = color
-        pixels = QPixmap(35, 12)
-        pixels.fill(color)
-        icon = QIcon(pixels)
+        icon = _swatchIcon( color.rgba() )
         self.setIcon( icon )
-        self.setIconSize(pixels.rect().size())
+        self.setIconSize( icon.availableSizes()[0] )
 
     #def event( self, event ):
         #print(event.type())
@@ -168,19 +333,35 @@ class UiLoader(QUiLoader):
             else:
                 return super().createWidget(className, parent, name)
 
+    # Cache of raw .ui file contents keyed by path and validated against the
+    # file's mtime, so repeated window constructions (and the log window and
+    # screenshot dialog, which share this loader) don't reread the XML from
+    # disk each time.
+    _ui_cache = {}
+
     @staticmethod
     def populateUI( parent, filepath ):
-        ui_file = QFile( filepath )
-        ui_file.open( QFile.ReadOnly )
+        mtime_ns = os.stat( filepath ).st_mtime_ns
+        cached = UiLoader._ui_cache.get( filepath )
+        if cached is None or cached[0] != mtime_ns:
+            ui_file = QFile( filepath )
+            ui_file.open( QFile.ReadOnly )
+            try:
+                cached = ( mtime_ns, ui_file.readAll() )
+            finally:
+                ui_file.close()
+            UiLoader._ui_cache[ filepath ] = cached
+        ui_buffer = QBuffer( cached[1] )
+        ui_buffer.open( QBuffer.ReadOnly )
         try:
             ui_loader = UiLoader( parent )
             ui_loader.registerCustomWidget( SequenceToolBox )
             ui_loader.registerCustomWidget( AutoResizingStackedWidget )
             ui_loader.registerCustomWidget( FileSelectionTreeWidget )
             ui_loader.registerCustomWidget( ColorButton )
-            ui_loader.load( ui_file )
+            ui_loader.load( ui_buffer )
         finally:
-            ui_file.close()
+            ui_buffer.close()
 
 def parseLCBBToolOutput( output ):
     # Find and parse the scaling factor from text with a format like this: 
@@ -203,10 +384,37 @@ def parseLCBBToolOutput( output ):
     return result
 
 
-def runLCBBTool( toolname, p2_input_file, p1_output_dir=Path('athena_tmp_output'),
-                 p3_scaffold='m13', p4_edge_sections=1, p5_vertex_design=1, p6_edge_number=0,
-                 p7_edge_length=42, p8_mesh_spacing=0.0, p9_runmode='s' ):
-    tooldir = toolname
+class LCBBToolResult:
+    '''
+    Results of a completed LCBB tool run
+
+    This mirrors the parts of the subprocess.run() return value that the
+    rest of Athena used to consume, plus the parsed tool outputs.
+    '''
+    def __init__( self, returncode, stdout, output_dir ):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.toolinfo = parseLCBBToolOutput( stdout )
+        if 'error' in self.toolinfo:
+            # Tool indicated error; override return code
+            self.returncode = 257
+        self.bildfiles = None
+        self.cndofile = None
+        self.output_dir = None
+        if self.returncode == 0:
+            self.bildfiles = list( output_dir.glob('*.bild') )
+            # A tool can exit 0 without writing a cndo file; don't let
+            # that raise inside the completion slot
+            self.cndofile = next( output_dir.glob('*.cndo'), None )
+            self.output_dir = output_dir
+
+
+@functools.lru_cache(maxsize=None)
+def _toolPath( toolname ):
+    # The platform check and path joins are invariant for the life of the
+    # process, so each tool's executable path is computed only once; the
+    # unknown-platform warning is likewise printed once rather than on
+    # every run.
     if platform.system() ==  'Windows':
         tool = '{}.exe'.format(toolname)
     elif platform.system() == 'Darwin':
@@ -214,6 +422,13 @@ def runLCBBTool( toolname, p2_input_file, p1_output_dir=Path('athena_tmp_output'
     else:
         print("WARNING: unknown platform '{}' for LCBB tool!".format(platform.system()), file=sys.stderr)
         tool = toolname
+    return os.path.join( ATHENA_DIR, 'tools', toolname, tool )
+
+
+def runLCBBTool( toolname, finished_callback, p2_input_file, p1_output_dir=Path('athena_tmp_output'),
+                 p3_scaffold='m13', p4_edge_sections=1, p5_vertex_design=1, p6_edge_number=0,
+                 p7_edge_length=42, p8_mesh_spacing=0.0, p9_runmode='s',
+                 output_callback=None, process=None, parent=None ):
 
     # Tools have problems reading files on read-only partitions, so workaround that.
     # This occurs commonly under OSX app translocation
@@ -229,23 +444,166 @@ def runLCBBTool( toolname, p2_input_file, p1_output_dir=Path('athena_tmp_output'
             # Ok to leave new file undeleted because athena_cleanup() will remove ATHENA_OUTPUT_DIR.
             p2_input_file = newfilename
 
-    wd = os.path.join( ATHENA_DIR, 'tools', tooldir )
-    toolpath = os.path.join( wd, tool )
+    toolpath = _toolPath( toolname )
     tool_call = [toolpath, p1_output_dir, p2_input_file, p3_scaffold, p4_edge_sections,
                            p5_vertex_design, p6_edge_number, p7_edge_length, p8_mesh_spacing, p9_runmode]
     tool_call_strs = [str(x) for x in tool_call]
 
-    print('Calling {} as follows'.format(tool), tool_call_strs)
-    result = subprocess.run(tool_call_strs, text=True, stderr=subprocess.STDOUT, stdout=subprocess.PIPE)
-    result.toolinfo= parseLCBBToolOutput( result.stdout )
-    if 'error' in result.toolinfo:
-        # Tool indicated error; override return code
-        result.returncode = 257
-    if result.returncode == 0:
-        result.bildfiles = list( p1_output_dir.glob('*.bild') )
-        result.cndofile = next( p1_output_dir.glob('*.cndo') )
-        result.output_dir = p1_output_dir
-    return result
+    print('Calling {} as follows'.format(toolname), tool_call_strs)
+    # Run the tool through an asynchronous QProcess rather than subprocess.run,
+    # so the GUI thread isn't frozen while the tool works.  finished_callback
+    # is invoked with an LCBBToolResult once the tool exits.
+    # The LCBB tools are one-shot executables with no batch or server mode,
+    # so successive runs cannot share a live worker process.  Callers may
+    # pass in a finished QProcess to recycle instead of building a new one.
+    if process is None:
+        process = QProcess( parent )
+    else:
+        # A recycled process still has the previous run's handlers
+        # attached; remove them before wiring up the new ones.
+        for signal in ( process.finished, process.readyReadStandardOutput,
+                        process.errorOccurred ):
+            try:
+                signal.disconnect()
+            except RuntimeError:
+                pass
+    process.setProcessChannelMode( QProcess.MergedChannels )
+    process.setProgram( tool_call_strs[0] )
+    process.setArguments( tool_call_strs[1:] )
+    # Tool output is consumed as it arrives, so progress can be streamed to
+    # output_callback during the run rather than shown all at once at the
+    # end; the accumulated chunks still form the complete stdout needed by
+    # parseLCBBToolOutput.
+    output_chunks = []
+    pending = [''] # partial line held over between reads
+    def handleOutput( final=False ):
+        text = bytes( process.readAllStandardOutput() ).decode( errors='replace' )
+        output_chunks.append( text )
+        if output_callback is None:
+            return
+        # Forward only complete lines: a read can end mid-line, and the
+        # log window appends each callback argument as its own paragraph,
+        # so flushing a partial line would split it across log entries.
+        lines = ( pending[0] + text ).split( '\n' )
+        pending[0] = lines.pop()
+        for line in lines:
+            output_callback( line )
+        if final and pending[0]:
+            output_callback( pending[0] )
+            pending[0] = ''
+    done = [False] # guard against reporting one run twice
+    def finish( returncode ):
+        if done[0]:
+            return
+        done[0] = True
+        finished_callback( LCBBToolResult( returncode, ''.join(output_chunks), p1_output_dir ) )
+    def handleFinished( exitCode, exitStatus=None ):
+        handleOutput( final=True ) # drain whatever arrived after the last readyRead
+        # On a crash the exit code is documented as invalid, so don't let
+        # it masquerade as success
+        if exitStatus is not None and exitStatus != QProcess.NormalExit:
+            exitCode = -1
+        finish( exitCode )
+    def handleError( error ):
+        # finished is never emitted for FailedToStart (e.g. a missing or
+        # non-executable tool binary), so report the failure from here;
+        # for crashes, which emit both signals, the done guard makes this
+        # a no-op alongside handleFinished.
+        handleOutput( final=True )
+        if output_callback:
+            output_callback( '{} process error: {}'.format( toolname, error ) )
+        finish( -1 )
+    process.readyReadStandardOutput.connect( handleOutput )
+    process.finished.connect( handleFinished )
+    process.errorOccurred.connect( handleError )
+    process.start()
+    return process
+
+def samplePlyFiles( dirname ):
+    '''
+    Return sorted absolute paths of the .ply files in a sample_inputs subdirectory
+
+    The parent directory is resolved once and entries are listed with
+    os.scandir, so no per-file stat or symlink-resolution syscalls are
+    needed; this matters when Athena is installed on a slow filesystem.
+    '''
+    sample_dir = Path( ATHENA_DIR, 'sample_inputs', dirname ).resolve()
+    with os.scandir( sample_dir ) as entries:
+        names = sorted( e.name for e in entries
+                        if e.name.endswith('.ply') and e.is_file(follow_symlinks=False) )
+    return [ Path( sample_dir, name ) for name in names ]
+
+
+# Manifest of sample-input scans, persisted across Athena runs.  This lives
+# in the user's home directory rather than ATHENA_OUTPUT_DIR, which is a
+# fresh temporary directory on every launch.
+SAMPLE_CACHE_PATH = Path.home() / '.athena_sample_cache.json'
+
+def sampleFileManifest( dirname ):
+    '''
+    Return (pretty_name, path) pairs for a sample_inputs subdirectory
+
+    Results are cached in a JSON manifest keyed by directory path and
+    validated against the directory's mtime, so a warm launch skips both
+    the directory scan and the name prettification; adding or removing
+    sample files invalidates the cached listing.
+    '''
+    sample_dir = Path( ATHENA_DIR, 'sample_inputs', dirname ).resolve()
+    mtime_ns = sample_dir.stat().st_mtime_ns
+    cache = dict()
+    try:
+        with open( SAMPLE_CACHE_PATH ) as cachefile:
+            cache = json.load( cachefile )
+    except (OSError, ValueError):
+        pass
+    entry = cache.get( str(sample_dir) )
+    if entry and entry.get('mtime_ns') == mtime_ns:
+        return [ (name, Path(pathstr)) for name, pathstr in entry['files'] ]
+    files = [ ( FileSelectionTreeWidget.prettyNameFromPath(ply), ply )
+              for ply in samplePlyFiles( dirname ) ]
+    cache[ str(sample_dir) ] = { 'mtime_ns': mtime_ns,
+                                 'files': [ [name, str(ply)] for name, ply in files ] }
+    try:
+        with open( SAMPLE_CACHE_PATH, 'w' ) as cachefile:
+            json.dump( cache, cachefile )
+    except OSError:
+        pass # The manifest is only an optimization; a read-only home is fine
+    return files
+
+
+class _SampleScanSignals( QObject ):
+    # QRunnable cannot declare signals of its own (it isn't a QObject, and
+    # PySide2 does not support inheriting from both), so the scan task
+    # carries this small envelope instead.
+    results = Signal( list )
+
+
+class SampleScanTask( QRunnable ):
+    '''
+    Thread-pool task that enumerates the sample-input directories
+
+    The directory scans and name prettification need no GUI-thread state,
+    so they run on QThreadPool while the window is busy painting; results
+    arrive back on the GUI thread as one queued signal carrying
+    (section, entries) pairs ready for addExampleFiles.
+    '''
+    def __init__( self ):
+        super().__init__()
+        self.signals = _SampleScanSignals()
+
+    def run( self ):
+        # QThreadPool swallows tracebacks from run(), so a failed scan of
+        # one directory (missing or unreadable) must not take the other
+        # directory's results and the signal emission down with it
+        results = []
+        for section, dirname in enumerate( ('2D', '3D') ):
+            try:
+                results.append( ( section, sampleFileManifest( dirname ) ) )
+            except OSError as err:
+                print( "WARNING: could not scan sample directory '{}': {}".format( dirname, err ),
+                       file=sys.stderr )
+        self.signals.results.emit( results )
+
 
 class AthenaWindow(QMainWindow):
     default_ui_path = os.path.join( ATHENA_DIR, 'ui', 'AthenaMainWindow.ui' )
@@ -257,6 +615,7 @@ class AthenaWindow(QMainWindow):
         self.centralWidget().setAttribute(Qt.WA_AcceptTouchEvents, False)
         #self.centralWidget().setAttribute(Qt.WA_TransparentForMouseEvents, True)
         self.toolresults = None
+        self.toolProcess = None
 
         self.statusMsg = QLabel("Ready.")
         self.statusBar().addWidget(self.statusMsg)
@@ -279,23 +638,6 @@ class AthenaWindow(QMainWindow):
 
         self.resetScaffoldBox()
 
-        self.geomView = viewer.AthenaViewer()
-        self.viewerWidget_dummy.deleteLater()
-        del self.viewerWidget_dummy
-        self.geomViewWidget = QWidget.createWindowContainer( self.geomView, self, Qt.SubWindow )
-        self.upperLayout.insertWidget( 1, self.geomViewWidget )
-        sizePolicy = QSizePolicy( QSizePolicy.Expanding, QSizePolicy.Expanding )
-        sizePolicy.setHorizontalStretch(1)
-        self.geomViewWidget.setSizePolicy(sizePolicy) 
-        self.geomViewWidget.setFocusPolicy( Qt.NoFocus )
-
-        self.screenshotDialog = screenshot.ScreenshotDialog(self, self.geomView)
-        self.actionScreenshot.triggered.connect( self.screenshotDialog.show )
-        self.screenshotDialog.screenshotSaved.connect( self.notifyScreenshotDone )
-
-        self.setupToolDefaults()
-        self.enable2DControls()
-
         self.toolRunButton.clicked.connect(self.runTool)
         self.saveButton.clicked.connect(self.saveOutput)
 
@@ -305,7 +647,6 @@ class AthenaWindow(QMainWindow):
         self.actionOpen.triggered.connect( self.selectAndAddFileToGeomList )
         self.actionAddScaffold.triggered.connect( self.selectAndAddScaffoldFile )
         self.actionResetViewerOptions.triggered.connect( self.resetDisplayOptions )
-        self.actionResetCamera.triggered.connect( self.geomView.resetCamera )
 
 
         # action groups cannot be set up in Qt Designer, so do that here
@@ -341,6 +682,34 @@ class AthenaWindow(QMainWindow):
             self.menuView.setSeparatorsCollapsible(False)
             self.menuView.addSeparator()
 
+        self.show()
+        self.log("Athena version {}".format(__version__))
+        # Defer the expensive parts of startup — the 3D viewer and the
+        # sample-file population — to the next event-loop tick, so the
+        # window shell paints before any GL context or file scanning work
+        # begins.
+        QTimer.singleShot( 0, self._deferredInit )
+
+    def _deferredInit( self ):
+        self.geomView = viewer.AthenaViewer()
+        self.viewerWidget_dummy.deleteLater()
+        del self.viewerWidget_dummy
+        self.geomViewWidget = QWidget.createWindowContainer( self.geomView, self, Qt.SubWindow )
+        self.upperLayout.insertWidget( 1, self.geomViewWidget )
+        sizePolicy = QSizePolicy( QSizePolicy.Expanding, QSizePolicy.Expanding )
+        sizePolicy.setHorizontalStretch(1)
+        self.geomViewWidget.setSizePolicy(sizePolicy)
+        self.geomViewWidget.setFocusPolicy( Qt.NoFocus )
+
+        self.screenshotDialog = screenshot.ScreenshotDialog(self, self.geomView)
+        self.actionScreenshot.triggered.connect( self.screenshotDialog.show )
+        self.screenshotDialog.screenshotSaved.connect( self.notifyScreenshotDone )
+
+        self.actionResetCamera.triggered.connect( self.geomView.resetCamera )
+
+        self.setupToolDefaults()
+        self.enable2DControls()
+
         self.displayCylinderBox.toggled.connect( self.geomView.toggleCylDisplay )
         self.geomView.toggleCylDisplay(self.displayCylinderBox.isChecked())
 
@@ -358,17 +727,20 @@ class AthenaWindow(QMainWindow):
 
         self.geometryList.newFileSelected.connect( self.newMesh )
 
-        def _setupColorButton( button, setter, signal, init_value ):
-            button.colorChosen.connect( setter )
-            signal.connect( button.setColor )
+        # Qt.UniqueConnection traps accidental double-wiring if deferred
+        # initialization is ever re-entered
+        color_button_setups = (
+            ( self.lineColorButton, self.geomView.setLineColor, self.geomView.lineColorChanged, self.geomView.lineColor() ),
+            ( self.flatColorButton, self.geomView.setFlatColor, self.geomView.flatColorChanged, self.geomView.flatColor() ),
+            ( self.bgColorButton, self.geomView.setBackgroundColor, self.geomView.backgroundColorChanged, self.geomView.backgroundColor() ),
+            ( self.warmColorButton, self.geomView.setWarmColor, self.geomView.warmColorChanged, self.geomView.warmColor() ),
+            ( self.coolColorButton, self.geomView.setCoolColor, self.geomView.coolColorChanged, self.geomView.coolColor() ) )
+
+        for button, setter, signal, init_value in color_button_setups:
+            button.colorChosen.connect( setter, Qt.UniqueConnection )
+            signal.connect( button.setColor, Qt.UniqueConnection )
             button.setColor( init_value )
 
-        _setupColorButton( self.lineColorButton, self.geomView.setLineColor, self.geomView.lineColorChanged, self.geomView.lineColor() )
-        _setupColorButton( self.flatColorButton, self.geomView.setFlatColor, self.geomView.flatColorChanged, self.geomView.flatColor() )
-        _setupColorButton( self.bgColorButton, self.geomView.setBackgroundColor, self.geomView.backgroundColorChanged, self.geomView.backgroundColor() )
-        _setupColorButton( self.warmColorButton, self.geomView.setWarmColor, self.geomView.warmColorChanged, self.geomView.warmColor() )
-        _setupColorButton( self.coolColorButton, self.geomView.setCoolColor, self.geomView.coolColorChanged, self.geomView.coolColor() )
-
         self.alphaSlider.valueChanged.connect( self.setViewerAlpha )
         self.geomView.alphaChanged.connect( self.handleAlphaChanged )
 
@@ -386,22 +758,22 @@ class AthenaWindow(QMainWindow):
         self.geomView.wireframeRenderingEnabledChanged.connect( self.controls_wireframe.setChecked )
 
         self.newMesh(None)
-        self.show()
-        self.log("Athena version {}".format(__version__))
 
     def resetScaffoldBox( self ):
         self.scaffoldBox.clear()
+        # Running maximum width of the scaffold names added so far
+        self._scaffold_max_w = 0
         self.scaffoldBox.addItem( "Default", "m13" )
         self.scaffoldBox.view().setTextElideMode(Qt.ElideRight)
         self.scaffoldBox.setCurrentIndex(0)
 
     def newSession( self ):
+        geom.invalidateBufferCache()
         self.resetScaffoldBox()
         self.newMesh(None)
         self.geometryList.clearSelection()
-        self.geometryList.topLevelItem(2).takeChildren()
-        for idx in range(3):
-            self.geometryList.collapseItem ( self.geometryList.topLevelItem(idx) )
+        self.geometryList.clearUserFiles()
+        self.geometryList.collapseAll()
         self.geomView.clearAllGeometry()
         self.geomView.resetBackgroundColor()
         self.geomView.resetParameters()
@@ -468,22 +840,30 @@ class AthenaWindow(QMainWindow):
             print("ERROR in _setViewSplit")
 
     def setupToolDefaults( self ):
+        # Scan the sample directories off-thread; the GUI thread only
+        # performs the bulk insertions once the results signal arrives.
+        # Keep a reference so the task isn't collected before it runs.
+        self._sampleScanTask = SampleScanTask()
+        self._sampleScanTask.signals.results.connect( self._addSampleFiles )
+        QThreadPool.globalInstance().start( self._sampleScanTask )
 
-        perdix_inputs = Path(ATHENA_DIR, "sample_inputs", "2D")
-        for ply in sorted(perdix_inputs.glob('*.ply')):
-            self.geometryList.add2DExampleFile( ply )
+    def _addSampleFiles( self, results ):
+        for section, entries in results:
+            self.geometryList.addExampleFiles( section, entries )
 
-        perdix_inputs = Path(ATHENA_DIR, "sample_inputs", "3D")
-        for ply in sorted(perdix_inputs.glob('*.ply')):
-            self.geometryList.add3DExampleFile( ply )
 
 
+    # Options for the file-open dialogs: icon lookups and symlink resolution
+    # both stat every directory entry shown, which can hang the dialog on
+    # slow network filesystems.
+    fileDialogOptions = QFileDialog.DontUseCustomDirectoryIcons | QFileDialog.DontResolveSymlinks
 
     def selectAndAddFileToGeomList( self ):
         fileName = QFileDialog.getOpenFileName( self,
                                                "Open geometry file",
                                                os.path.join(ATHENA_DIR, 'sample_inputs'),
-                                               "Geometry files (*.ply)")
+                                               "Geometry files (*.ply)",
+                                               options=self.fileDialogOptions)
         filepath = Path(fileName[0])
         if( filepath.is_file() ):
             self.geometryList.addUserFile( filepath, force_select=True )
@@ -492,14 +872,19 @@ class AthenaWindow(QMainWindow):
         fileName = QFileDialog.getOpenFileName( self,
                                                 "Open scaffold file",
                                                 ATHENA_DIR,
-                                                "Text files (*)" )
+                                                "Text files (*)",
+                                                options=self.fileDialogOptions )
         filepath = Path(fileName[0])
         if( filepath.is_file() ):
             self.scaffoldBox.addItem( filepath.name, filepath )
             self.scaffoldBox.setCurrentIndex( self.scaffoldBox.count() - 1 )
-            w = self.scaffoldBox.minimumSizeHint().width()
-            self.scaffoldBox.view().setMinimumWidth( w )
-            self.scaffoldBox.view().reset()
+            # Measure just the new name rather than minimumSizeHint(),
+            # which walks every item, and only widen the popup when the
+            # running maximum actually grows
+            w = self.scaffoldBox.fontMetrics().horizontalAdvance( filepath.name ) + 24
+            if w > self._scaffold_max_w:
+                self._scaffold_max_w = w
+                self.scaffoldBox.view().setMinimumWidth( w )
 
     def enable2DControls( self ):
         self.renderControls.setCurrentIndex( 0 )
@@ -583,24 +968,44 @@ class AthenaWindow(QMainWindow):
         self.statusMsg.setText( msg )
 
     def _toolFilenames( self, toolname ):
-        active_item = self.geometryList.currentItem()
-        infile_path = active_item.data(0, Qt.UserRole)
-        infile_name = active_item.text(0)
+        active_index = self.geometryList.currentIndex()
+        infile_path = active_index.data( Qt.UserRole )
+        infile_name = active_index.data( Qt.DisplayRole )
         output_subdir = datetime.now().strftime('%y%m%d%H%M%S_'+toolname+'_'+infile_name)
         outfile_dir_path = ATHENA_OUTPUT_DIR / output_subdir
         return infile_path, outfile_dir_path
 
     def runTool( self ):
+        # Don't disable the run button until a run can actually start;
+        # without a selected geometry there is nothing to do
+        if self.geometryList.currentIndex().data( Qt.UserRole ) is None:
+            self.updateStatus( 'No geometry file selected.' )
+            return
         tool_chooser = self.toolControls.currentWidget()
         if tool_chooser == self.tools_2D:
             toolkey = (0, self.toolBox_2D.currentIndex() )
         elif tool_chooser == self.tools_3D:
             toolkey = (1, self.toolBox_3D.currentIndex() )
         else:
-            print( "ERROR: No available tool" ) 
+            print( "ERROR: No available tool" )
 
+        # Tool runs are asynchronous; disallow a second run until the
+        # active one completes
+        self.toolRunButton.setEnabled( False )
         self.toolMap[ toolkey ](self)
 
+    def _toolFinisher( self, toolname ):
+        # Create the completion callback for an asynchronous tool run
+        def finished( result ):
+            # Whatever happens while handling the outputs, the run button
+            # must come back, or tool runs are locked out for the session
+            try:
+                self.updateStatus('{} returned {}.'.format(toolname, self._humanReadableReturnValue(result)))
+                self.newOutputs( result )
+            finally:
+                self.toolRunButton.setEnabled( True )
+        return finished
+
     def _humanReadableReturnValue( self, process ):
         if process.returncode == 0:
             human_retval = 'success'
@@ -613,55 +1018,51 @@ class AthenaWindow(QMainWindow):
     def runPERDIX( self ):
         self.updateStatus('Running PERDIX...')
         infile_path, outfile_dir_path = self._toolFilenames( 'PERDIX' )
-        process = runLCBBTool ('PERDIX',
+        self.toolProcess = runLCBBTool ('PERDIX', self._toolFinisher('PERDIX'),
                                p1_output_dir=outfile_dir_path,
                                p2_input_file=infile_path,
                                p3_scaffold=self.scaffoldBox.currentData(),
-                               p7_edge_length=self.perdixEdgeLengthSpinner.value())
-        self.log( process.stdout )
-        self.updateStatus('PERDIX returned {}.'.format(self._humanReadableReturnValue(process)))
-        self.newOutputs(process)
+                               p7_edge_length=self.perdixEdgeLengthSpinner.value(),
+                               output_callback=self.log,
+                               process=self.toolProcess, parent=self)
 
     def runTALOS( self ):
         self.updateStatus('Running TALOS...')
         infile_path, outfile_dir_path = self._toolFilenames( 'TALOS' )
-        process = runLCBBTool('TALOS',
+        self.toolProcess = runLCBBTool('TALOS', self._toolFinisher('TALOS'),
                               p1_output_dir=outfile_dir_path,
                               p2_input_file=infile_path,
                               p3_scaffold=self.scaffoldBox.currentData(),
                               p4_edge_sections=self.talosEdgeSectionBox.currentIndex()+2,
                               p5_vertex_design=self.talosVertexDesignBox.currentIndex()+1,
-                              p7_edge_length=self.talosEdgeLengthSpinner.value())
-        self.log( process.stdout )
-        self.updateStatus('TALOS returned {}.'.format(self._humanReadableReturnValue(process)))
-        self.newOutputs(process)
+                              p7_edge_length=self.talosEdgeLengthSpinner.value(),
+                              output_callback=self.log,
+                              process=self.toolProcess, parent=self)
 
     def runDAEDALUS2( self ):
         self.updateStatus('Running DAEDALUS...')
         infile_path, outfile_dir_path = self._toolFilenames( 'DAEDALUS2' )
-        process = runLCBBTool('DAEDALUS2',
+        self.toolProcess = runLCBBTool('DAEDALUS2', self._toolFinisher('DAEDALUS'),
                               p1_output_dir=outfile_dir_path,
                               p2_input_file=infile_path,
                               p3_scaffold=self.scaffoldBox.currentData(),
                               p4_edge_sections=1, p5_vertex_design=2,
-                              p7_edge_length=self.daedalusEdgeLengthSpinner.value())
-        self.log( process.stdout )
-        self.updateStatus('DAEDALUS returned {}.'.format(self._humanReadableReturnValue(process)))
-        self.newOutputs(process)
+                              p7_edge_length=self.daedalusEdgeLengthSpinner.value(),
+                              output_callback=self.log,
+                              process=self.toolProcess, parent=self)
 
 
     def runMETIS( self ):
         self.updateStatus('Running METIS...')
         infile_path, outfile_dir_path = self._toolFilenames( 'METIS' )
-        process = runLCBBTool ('METIS',
+        self.toolProcess = runLCBBTool ('METIS', self._toolFinisher('METIS'),
                                p1_output_dir=outfile_dir_path,
                                p2_input_file=infile_path,
                                p3_scaffold=self.scaffoldBox.currentData(),
                                p4_edge_sections=3, p5_vertex_design=2,
-                               p7_edge_length=self.metisEdgeLengthSpinner.value())
-        self.log( process.stdout )
-        self.updateStatus('METIS returned {}.'.format(self._humanReadableReturnValue(process)))
-        self.newOutputs(process)
+                               p7_edge_length=self.metisEdgeLengthSpinner.value(),
+                               output_callback=self.log,
+                               process=self.toolProcess, parent=self)
 
     toolMap = { (0, 0): runPERDIX,
                 (0, 1): runMETIS,
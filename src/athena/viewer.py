@@ -1,4 +1,5 @@
 from pathlib import Path
+from collections import OrderedDict
 import math
 import numpy as np
 
@@ -589,6 +590,11 @@ class AthenaViewer(Qt3DExtras.Qt3DWindow, metaclass=_metaParameters):
 
         self.meshEntity = None
 
+        # Recently triangulated meshes, keyed by (path, mtime); flipping
+        # between a few files re-uploads buffers rather than re-parsing
+        # and re-triangulating the ply each time
+        self._meshBufferCache = OrderedDict()
+
         class DecorationEntity(Qt3DCore.QEntity):
             def __init__(self, parent):
                 super().__init__(parent)
@@ -698,12 +704,22 @@ class AthenaViewer(Qt3DExtras.Qt3DWindow, metaclass=_metaParameters):
                 ent.cones.deleteLater()
                 ent.cones = None
 
+    _meshBufferCacheSize = 8
+
     def reloadGeom(self, filepath):
 
         self.meshFilepath = filepath
-        self.plydata = PlyData.read(filepath)
+        cache_key = ( str(filepath), filepath.stat().st_mtime_ns )
+        buffers = self._meshBufferCache.get( cache_key )
+        if buffers is None:
+            buffers = plymesh.buildMeshBuffers( PlyData.read(filepath) )
+            self._meshBufferCache[ cache_key ] = buffers
+            if len(self._meshBufferCache) > self._meshBufferCacheSize:
+                self._meshBufferCache.popitem( last=False )
+        else:
+            self._meshBufferCache.move_to_end( cache_key )
         self.clearAllGeometry()
-        self.meshEntity = plymesh.PlyMesh(self.meshEntityParent, self.plydata)
+        self.meshEntity = plymesh.PlyMesh(self.meshEntityParent, buffers)
         mesh_3d = self.meshEntity.dimensions == 3
         self.camControl.newMesh(self.meshEntity)
         if( mesh_3d ):